@@ -6,7 +6,6 @@ import io
 import zipfile
 import sqlite3
 from pathlib import Path
-from tempfile import TemporaryDirectory
 
 from fastapi import APIRouter, Query, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
@@ -243,22 +242,18 @@ async def export_catalog_zip():
         
         with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
             # 1. Create a safe backup of the sqlite database using sqlite3 backup API
-            with TemporaryDirectory() as tmpdir:
-                temp_db_path = Path(tmpdir) / "profiles.db"
-                
-                src_conn = sqlite3.connect(str(db_path))
-                dst_conn = sqlite3.connect(str(temp_db_path))
-                
-                # Run the backup synchronously
+            # (page-level copy into an in-memory database, serialized straight to bytes)
+            src_conn = sqlite3.connect(str(db_path))
+            dst_conn = sqlite3.connect(":memory:")
+            try:
                 src_conn.backup(dst_conn)
-                
+                db_bytes = dst_conn.serialize()
+            finally:
                 dst_conn.close()
                 src_conn.close()
-                
-                # Read backup bytes and write to ZIP
-                db_bytes = temp_db_path.read_bytes()
-                zf.writestr("profiles.db", db_bytes)
-                logger.info(f"[export_catalog_zip] Added profiles.db to ZIP, size={len(db_bytes)} bytes")
+            
+            zf.writestr("profiles.db", db_bytes)
+            logger.info(f"[export_catalog_zip] Added profiles.db to ZIP, size={len(db_bytes)} bytes")
             
             # 2. Add images to the ZIP archive
             if images_dir.exists() and images_dir.is_dir():
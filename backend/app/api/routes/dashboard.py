@@ -14,7 +14,10 @@ logger = logging.getLogger(__name__)
 
 from app.core.config import settings
 from app.services.excel_service import excel_service
-from app.services.catalog_service import catalog_service
+from app.services.catalog_service import (
+    catalog_service,
+    PROCESSING_KEYWORD_PATTERNS,
+)
 from app.schemas.dashboard import (
     DashboardResponse,
     HangerData,
@@ -28,8 +31,7 @@ from app.schemas.profile import ProfileInfo
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
-# Processing keywords to extract from profile names
-PROCESSING_KEYWORDS = ['окно', 'греб', 'гребенка', 'сверло', 'фреза', 'паз']
+_WHITESPACE_RE = re.compile(r'\s+')
 
 
 def parse_profile_name(name: str) -> Tuple[str, List[str]]:
@@ -45,19 +47,18 @@ def parse_profile_name(name: str) -> Tuple[str, List[str]]:
     found_processing = []
     clean_name = name
     
-    for keyword in PROCESSING_KEYWORDS:
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, clean_name, re.IGNORECASE):
+    for keyword, pattern in PROCESSING_KEYWORD_PATTERNS:
+        if pattern.search(clean_name):
             # Normalize "гребенка" to "греб"
             if keyword == 'гребенка':
                 found_processing.append('греб')
             else:
                 found_processing.append(keyword)
             # Remove keyword from name
-            clean_name = re.sub(pattern, '', clean_name, flags=re.IGNORECASE)
+            clean_name = pattern.sub('', clean_name)
     
     # Clean up the name
-    clean_name = re.sub(r'\s+', ' ', clean_name).strip()
+    clean_name = _WHITESPACE_RE.sub(' ', clean_name).strip()
     clean_name = clean_name.rstrip('+,;').strip()
     
     return clean_name, found_processing
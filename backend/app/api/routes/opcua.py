@@ -4,7 +4,7 @@ OPC UA API routes - подключение к OMRON PLC и чтение данн
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
@@ -141,40 +141,40 @@ def _build_latest_hanger_meta() -> Dict[str, Dict[str, str]]:
 
 # Module-level cache for hanger meta to avoid re-reading Excel on every request
 _hanger_meta_cache: Optional[Dict[str, Dict[str, str]]] = None
-_hanger_meta_cache_mtime: Optional[float] = None
+_hanger_meta_cache_stat: Optional[Tuple[int, int]] = None
 _hanger_meta_lock = asyncio.Lock()
 
 
 async def _get_hanger_meta_async() -> Dict[str, Dict[str, str]]:
     """Get hanger meta with caching and thread-pool execution.
     
-    Uses excel_service cache mtime to invalidate only when Excel data changes.
+    Uses excel_service cache stat (mtime, size) to invalidate only when Excel data changes.
     Runs the heavy sync work in a thread pool to avoid blocking the event loop.
     Uses asyncio.Lock to prevent multiple concurrent cache builds.
     """
-    global _hanger_meta_cache, _hanger_meta_cache_mtime
+    global _hanger_meta_cache, _hanger_meta_cache_stat
 
-    current_mtime = excel_service.cache_mtime
+    current_stat = excel_service.cache_stat
 
     # Fast path: cache hit without locking
-    if _hanger_meta_cache is not None and _hanger_meta_cache_mtime == current_mtime:
+    if _hanger_meta_cache is not None and _hanger_meta_cache_stat == current_stat:
         return _hanger_meta_cache
 
     # Slow path: acquire lock and build cache
     async with _hanger_meta_lock:
         # Double-check after acquiring lock
-        if _hanger_meta_cache is not None and _hanger_meta_cache_mtime == current_mtime:
+        if _hanger_meta_cache is not None and _hanger_meta_cache_stat == current_stat:
             return _hanger_meta_cache
 
         # Cache miss: build in thread pool to avoid blocking event loop
-        logger.info(f"[OPC UA] Building hanger meta cache (Excel mtime: {current_mtime})...")
+        logger.info(f"[OPC UA] Building hanger meta cache (Excel stat: {current_stat})...")
         start = datetime.now()
         result = await asyncio.to_thread(_build_latest_hanger_meta)
         elapsed = (datetime.now() - start).total_seconds()
         logger.info(f"[OPC UA] Hanger meta cache built: {len(result)} entries in {elapsed:.2f}s")
 
         _hanger_meta_cache = result
-        _hanger_meta_cache_mtime = current_mtime
+        _hanger_meta_cache_stat = current_stat
         return result
 
 
@@ -5,6 +5,8 @@ Provides functions for:
 - Normalizing text for search (Latin ↔ Cyrillic equivalence)
 - Transliterating Cyrillic to Latin for safe filenames
 """
+import re
+from functools import lru_cache
 
 # Mapping of similar characters to unified lowercase Cyrillic form
 # Latin and Cyrillic versions normalize to the same Cyrillic character
@@ -44,7 +46,27 @@ TRANSLITERATION_MAP = {
     'Э': 'E', 'Ю': 'Yu', 'Я': 'Ya',
 }
 
+# str.translate table for normalize_text; separators are deleted for flexible matching
+_NORMALIZE_TABLE = str.maketrans({
+    **CYRILLIC_LATIN_MAP,
+    **dict.fromkeys('- ._/\\'),
+})
 
+# Already-normalized text (lowercase Cyrillic and digits) is a fixed point of normalize_text
+_NORMALIZED_RE = re.compile(r'[0-9а-яё]+')
+
+
+# str.translate table for transliterate_cyrillic (multi-letter and empty values allowed)
+_TRANSLITERATION_TABLE = str.maketrans(TRANSLITERATION_MAP)
+
+# safe_filename: spaces and slashes become dashes, then anything but
+# alphanumerics (\w == str.isalnum() + '_') and '-', '.' is dropped
+_FILENAME_DASH_TABLE = str.maketrans({' ': '-', '/': '-'})
+_FILENAME_UNSAFE_RE = re.compile(r'[^\w.\-]')
+
+
+# Pure function called for every profile name on each search - memoize it
+@lru_cache(maxsize=4096)
 def normalize_text(text: str | None) -> str:
     """
     Normalize text for search by converting to unified lowercase Cyrillic form.
@@ -70,17 +92,13 @@ def normalize_text(text: str | None) -> str:
         return ''
     
     text = str(text)
-    result = []
+    # Quick check: normalize_text(normalize_text(x)) returns without rebuilding the string
+    if _NORMALIZED_RE.fullmatch(text):
+        return text
     
-    for char in text:
-        # Skip separators for flexible matching
-        if char in ('-', ' ', '.', '_', '/', '\\'):
-            continue
-        # Map through table (Latin→Cyrillic, Cyrillic→lowercase)
-        mapped = CYRILLIC_LATIN_MAP.get(char, char.lower())
-        result.append(mapped)
-    
-    return ''.join(result)
+    # Map through table (Latin→Cyrillic, Cyrillic→lowercase, separators dropped),
+    # then lowercase whatever the table didn't cover
+    return text.translate(_NORMALIZE_TABLE).lower()
 
 
 def transliterate_cyrillic(text: str | None) -> str:
@@ -101,13 +119,7 @@ def transliterate_cyrillic(text: str | None) -> str:
     if not text:
         return ''
     
-    text = str(text)
-    result = []
-    
-    for char in text:
-        result.append(TRANSLITERATION_MAP.get(char, char))
-    
-    return ''.join(result)
+    return str(text).translate(_TRANSLITERATION_TABLE)
 
 
 def safe_filename(text: str | None) -> str:
@@ -127,14 +139,7 @@ def safe_filename(text: str | None) -> str:
     transliterated = transliterate_cyrillic(text)
     
     # Remove or replace unsafe characters
-    safe_chars = []
-    for char in transliterated:
-        if char.isalnum() or char in ('-', '_', '.'):
-            safe_chars.append(char)
-        elif char in (' ', '/'):
-            safe_chars.append('-')
-    
-    return ''.join(safe_chars)
+    return _FILENAME_UNSAFE_RE.sub('', transliterated.translate(_FILENAME_DASH_TABLE))
 
 
 def extract_digits(text: str | None) -> str:
@@ -149,4 +154,5 @@ def extract_digits(text: str | None) -> str:
     """
     if not text:
         return ''
-    return ''.join(c for c in str(text) if c.isdigit())
+    # filter() with the unbound str.isdigit runs without a Python-level loop body
+    return ''.join(filter(str.isdigit, str(text)))
@@ -6,11 +6,11 @@ import os
 import re
 import uuid
 from datetime import datetime, timezone
-from difflib import SequenceMatcher
 from pathlib import Path
 from typing import Optional, List, Tuple
 
 from PIL import Image
+from rapidfuzz import fuzz
 from sqlalchemy import select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,6 +20,18 @@ from app.schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse, P
 from app.core.text_utils import normalize_text, safe_filename
 from app.core.config import settings
 
+# Processing keywords to extract from profile names (shared with dashboard routes)
+PROCESSING_KEYWORDS = ['окно', 'греб', 'гребенка', 'сверло', 'фреза', 'паз']
+# (keyword, whole-word pattern) pairs, compiled once and applied in keyword order
+PROCESSING_KEYWORD_PATTERNS = [
+    (keyword, re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE))
+    for keyword in PROCESSING_KEYWORDS
+]
+_WHITESPACE_RE = re.compile(r'\s+')
+_DIGIT_RE = re.compile(r'\d')
+# Letter prefix + leading digits of a profile name: "СРЛ80" → ("СРЛ", "80")
+_PREFIX_DIGITS_RE = re.compile(r'^([А-Яа-яA-Za-z]+)(\d+)')
+
 
 class CatalogService:
     """
@@ -80,9 +92,12 @@ class CatalogService:
             result = await sess.execute(stmt)
             profiles = result.scalars().all()
             
+            query_digits = ''.join(c for c in normalized_query if c.isdigit())
             matches = []
             for profile in profiles:
-                match_priority = self._calculate_match_priority(profile, normalized_query)
+                match_priority = self._calculate_match_priority(
+                    profile, normalized_query, query_digits
+                )
                 if match_priority is not None:
                     matches.append((profile, match_priority))
             
@@ -108,7 +123,8 @@ class CatalogService:
     def _calculate_match_priority(
         self,
         profile: Profile,
-        normalized_query: str
+        normalized_query: str,
+        query_digits: Optional[str] = None
     ) -> Optional[int]:
         """
         Calculate match priority for a profile against a query.
@@ -119,6 +135,9 @@ class CatalogService:
         - 3: Notes contain query
         - 4: Quantity or length match
         
+        query_digits can be passed precomputed when scoring many profiles
+        against the same query.
+
         Returns None if no match.
         """
         normalized_name = normalize_text(profile.name)
@@ -138,7 +157,8 @@ class CatalogService:
                 return 3
         
         # Priority 4: Quantity or length match (numeric search)
-        query_digits = ''.join(c for c in normalized_query if c.isdigit())
+        if query_digits is None:
+            query_digits = ''.join(c for c in normalized_query if c.isdigit())
         if query_digits:
             if profile.quantity_per_hanger is not None:
                 if query_digits in str(profile.quantity_per_hanger):
@@ -774,20 +794,25 @@ class CatalogService:
             async with get_session() as sess:
                 return await _delete(sess)
     
-    def _calculate_similarity(self, s1: str, s2: str) -> float:
+    def _calculate_similarity(self, s1: str, s2: str, threshold: float = 0.0) -> float:
         """
-        Calculate similarity ratio between two strings using SequenceMatcher.
+        Calculate similarity ratio between two strings using RapidFuzz (C++).
         
         Args:
             s1: First string
             s2: Second string
+            threshold: Scores below this are reported as 0.0; lets the scorer
+                bail out early (length bound / banded distance) on hopeless pairs
         
         Returns:
             Similarity ratio between 0.0 and 1.0
         """
         if not s1 or not s2:
             return 0.0
-        return SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
+        s1, s2 = s1.lower(), s2.lower()
+        if s1 == s2:
+            return 1.0
+        return fuzz.ratio(s1, s2, score_cutoff=threshold * 100) / 100.0
     
     async def delete_profile(
         self,
@@ -843,7 +868,7 @@ class CatalogService:
         """
         Find profiles with similar names using fuzzy matching.
         
-        Uses SequenceMatcher for similarity scoring. Results are ordered
+        Uses RapidFuzz for similarity scoring. Results are ordered
         by similarity score (highest first).
         
         Args:
@@ -868,7 +893,7 @@ class CatalogService:
             matches = []
             for profile in profiles:
                 normalized_name = normalize_text(profile.name)
-                similarity = self._calculate_similarity(normalized_query, normalized_name)
+                similarity = self._calculate_similarity(normalized_query, normalized_name, threshold)
                 
                 if similarity >= threshold:
                     matches.append((profile, similarity))
@@ -899,27 +924,24 @@ class CatalogService:
         "СРП228 окно" → "СРП228"
         "юп-3233 греб + сверло" → "юп-3233"
         """
-        import re
         if not text:
             return ""
         
         text = str(text).strip()
         
         # Remove processing keywords
-        for keyword in ['окно', 'греб', 'гребенка', 'сверло', 'фреза', 'паз']:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        for _, pattern in PROCESSING_KEYWORD_PATTERNS:
+            text = pattern.sub('', text)
         
         # Clean up
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         text = text.rstrip('+,;').strip()
         
         return text
     
     def _extract_digits(self, text: str) -> str:
         """Extract all digits from text."""
-        import re
-        return ''.join(re.findall(r'\d', str(text)))
+        return ''.join(_DIGIT_RE.findall(str(text)))
 
     async def get_profiles_photos_batch(
         self,
@@ -990,7 +1012,7 @@ class CatalogService:
                 
                 # Extract prefix and digits for prefix+digits matching
                 # e.g., "СРЛ80" → prefix="срл", digits="80"
-                match = re.match(r'^([А-Яа-яA-Za-z]+)(\d+)', profile.name)
+                match = _PREFIX_DIGITS_RE.match(profile.name)
                 if match:
                     prefix = normalize_text(match.group(1))  # Normalize prefix
                     digits = match.group(2)
@@ -1026,7 +1048,7 @@ class CatalogService:
                     continue
                 
                 # Stage 3: Prefix + digits match (most specific)
-                match = re.match(r'^([А-Яа-яA-Za-z]+)(\d+)', clean_name)
+                match = _PREFIX_DIGITS_RE.match(clean_name)
                 if match:
                     prefix = normalize_text(match.group(1))  # Normalize prefix
                     digits = match.group(2)
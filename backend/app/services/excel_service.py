@@ -17,6 +17,29 @@ from app.core.text_utils import normalize_text
 
 logger = logging.getLogger(__name__)
 
+# Separators between profiles in one cell: "Profile1 + Profile2", "Profile1/Profile2"
+_PROFILE_SEP_RE = re.compile(r'\s*[+/]\s*')
+
+# Processing markers (keyword in text → processing type), in reporting order
+_PROCESSING_MARKERS = (
+    ('окно', 'окно'),
+    ('греб', 'греб'),
+    ('сверло', 'сверло'),
+    ('фреза', 'фреза'),
+    ('паз', 'паз'),
+    ('отв', 'отверстие'),
+)
+# One alternation finds every marker in a single scan of the text
+_PROCESSING_RE = re.compile(
+    r'\b(' + '|'.join(kw for kw, _ in _PROCESSING_MARKERS) + r')\b',
+    re.IGNORECASE,
+)
+
+
+def _empty_cells(series: pd.Series) -> pd.Series:
+    """Vectorized check for empty cells (NaN, blank, '—', 'nan', 'NaT')."""
+    return series.isna() | series.astype(str).str.strip().isin(('', '—', 'nan', 'NaT'))
+
 
 class ExcelService:
     """
@@ -63,7 +86,8 @@ class ExcelService:
 
     def __init__(self):
         self._cache: Optional[pd.DataFrame] = None
-        self._cache_mtime: Optional[float] = None
+        # (st_mtime_ns, st_size) of the file the cache was read from
+        self._cache_stat: Optional[Tuple[int, int]] = None
         self._cache_path: Optional[Path] = None
         self._active_file_name: Optional[str] = self._load_persisted_active_file()
 
@@ -96,27 +120,27 @@ class ExcelService:
             logger.warning(f"Could not restart ExcelWatcher for new path: {e}")
     
     @property
-    def cache_mtime(self) -> Optional[float]:
-        """Get current cache modification time (for cache invalidation tracking)."""
-        return self._cache_mtime
+    def cache_stat(self) -> Optional[Tuple[int, int]]:
+        """Get (mtime_ns, size) of the cached file (for cache invalidation tracking)."""
+        return self._cache_stat
 
     def invalidate_cache(self) -> None:
         """Force cache invalidation."""
         self._cache = None
-        self._cache_mtime = None
+        self._cache_stat = None
         self._cache_path = None
     
-    def _is_cache_valid(self, file_path: Path) -> bool:
-        """Check if cached data is still valid."""
+    def _is_cache_valid(self, file_path: Path, file_stat: Tuple[int, int]) -> bool:
+        """Check if cached data is still valid.
+
+        file_stat is (st_mtime_ns, st_size): mtime alone is coarse on network
+        shares, the size catches rewrites within the same timestamp.
+        """
         if self._cache is None:
             return False
         if self._cache_path != file_path:
             return False
-        try:
-            current_mtime = file_path.stat().st_mtime
-            return self._cache_mtime == current_mtime
-        except OSError:
-            return False
+        return self._cache_stat == file_stat
     
     def get_dataframe(
         self,
@@ -136,11 +160,17 @@ class ExcelService:
             DataFrame with production data
         """
         path = file_path or self.current_path
-        if not path or not path.exists():
+        if not path:
+            return pd.DataFrame()
+        # Single stat serves as both the existence check and the cache key
+        try:
+            st = path.stat()
+        except OSError:
             return pd.DataFrame()
+        file_stat = (st.st_mtime_ns, st.st_size)
 
         # Check cache validity
-        if self._is_cache_valid(path):
+        if self._is_cache_valid(path, file_stat):
             logger.info(f"[CACHE HIT] Using cached data: {len(self._cache)} rows")
             df = self._cache.copy()
         else:
@@ -173,7 +203,7 @@ class ExcelService:
                 logger.info(f"[EXCEL FILTERED] {len(df)} valid rows after filtering")
                 
                 self._cache = df
-                self._cache_mtime = path.stat().st_mtime
+                self._cache_stat = file_stat
                 self._cache_path = path
             except Exception as e:
                 logger.error(f"[EXCEL ERROR] Failed to read Excel file: {e}")
@@ -213,27 +243,12 @@ class ExcelService:
             return {'name': '', 'canonical_name': '', 'processing': []}
         
         text = str(text).strip()
-        processing = []
-        
-        # Common processing patterns
-        patterns = [
-            (r'\bокно\b', 'окно'),
-            (r'\bгреб\b', 'греб'),
-            (r'\bсверло\b', 'сверло'),
-            (r'\bфреза\b', 'фреза'),
-            (r'\bпаз\b', 'паз'),
-            (r'\bотв\b', 'отверстие'),
-        ]
-        
-        text_lower = text.lower()
-        for pattern, proc_name in patterns:
-            if re.search(pattern, text_lower):
-                processing.append(proc_name)
+        
+        found = {m.lower() for m in _PROCESSING_RE.findall(text)}
+        processing = [proc_name for kw, proc_name in _PROCESSING_MARKERS if kw in found]
         
         # Extract canonical name (remove processing markers)
-        canonical = text
-        for pattern, _ in patterns:
-            canonical = re.sub(pattern, '', canonical, flags=re.IGNORECASE)
+        canonical = _PROCESSING_RE.sub('', text) if found else text
         canonical = re.sub(r'\s+', ' ', canonical).strip()
         canonical = re.sub(r'[+\-*/]+$', '', canonical).strip()
         
@@ -263,11 +278,10 @@ class ExcelService:
         text = str(text).strip()
         
         # Split by profile separators
-        parts = re.split(r'[+/]', text)
+        parts = _PROFILE_SEP_RE.split(text)
         
         profiles = []
         for part in parts:
-            part = part.strip()
             if part:
                 profiles.append(self.parse_profile_with_processing(part))
         
@@ -316,14 +330,17 @@ class ExcelService:
         # Filter out completely empty rows for non-loading modes
         # This ensures sidebar gets a mix of loading and completed rows
         if not loading_only:
-            def _is_empty_val(v):
-                return pd.isna(v) or str(v).strip() in ('', '—', 'nan', 'NaT')
-            
-            mask = ~(df.apply(lambda row: _is_empty_val(row.get('profile')) 
-                              and _is_empty_val(row.get('material_type'))
-                              and _is_empty_val(row.get('time')), axis=1))
-            df = df[mask]
+            df = df[~(_empty_cells(df['profile'])
+                      & _empty_cells(df['material_type'])
+                      & _empty_cells(df['time']))]
             logger.info(f"[FILTER] After removing empty rows: {len(df)} rows")
+
+            # Only the newest `limit` records are returned, so format just the tail.
+            # Drop the rows _process_dataframe would skip first, so the tail is exact.
+            df = df[~(_empty_cells(df['number'])
+                      & _empty_cells(df['profile'])
+                      & _empty_cells(df['material_type']))]
+            df = df.tail(limit)
         
         # Process records with filtering
         records = self._process_dataframe(df, loading_only=loading_only)
@@ -367,19 +384,17 @@ class ExcelService:
             except Exception as e:
                 logger.warning(f"[FILTER] Could not filter by date: {e}")
         
+        # Skip completely empty rows (all key fields are '—' or empty)
+        df = df[~(_empty_cells(df['number'])
+                  & _empty_cells(df['profile'])
+                  & _empty_cells(df['material_type']))]
+        # For loading_only mode: time must be EMPTY (this indicates a loading row, not unloading)
+        if loading_only:
+            df = df[_empty_cells(df['time'])]
+        
         for _, row in df.iterrows():
             date_val = row.get('date')
             material_type = row.get('material_type')
-            time_val = row.get('time')
-            number_val = row.get('number')
-            profile_val = row.get('profile')
-            
-            # Skip completely empty rows (all key fields are '—' or empty)
-            def _is_empty(v):
-                return pd.isna(v) or str(v).strip() in ('', '—', 'nan', 'NaT')
-            
-            if _is_empty(number_val) and _is_empty(profile_val) and _is_empty(material_type):
-                continue
             
             # For loading_only mode: strict filtering
             if loading_only:
@@ -389,9 +404,6 @@ class ExcelService:
                 # Material type must be filled
                 if pd.isna(material_type) or not material_type or str(material_type).strip() in ('', '—'):
                     continue
-                # Time must be EMPTY (this indicates a loading row, not unloading)
-                if pd.notna(time_val) and str(time_val).strip() not in ('', '—', 'nan', 'NaT'):
-                    continue
             
             # Handle lamels (can be "30+30" or number)
             lamels = row.get('lamels_qty')
@@ -480,19 +492,18 @@ class ExcelService:
         if df.empty:
             return []
         
-        # Sort by date descending if date column exists
+        # Take the newest rows by date if date column exists;
+        # nlargest is a partial sort (O(n log k)) and keeps NaT rows last like sort_values
         date_col = 'date' if 'date' in df.columns else 'Дата' if 'Дата' in df.columns else None
         if date_col:
             try:
                 df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-                df = df.sort_values(date_col, ascending=False)
+                return df.nlargest(limit, date_col).to_dict('records')
             except Exception:
                 pass
         
         # Limit results
-        df = df.head(limit)
-        
-        return df.to_dict('records')
+        return df.head(limit).to_dict('records')
     
     def get_recent_missing_profiles(
         self,
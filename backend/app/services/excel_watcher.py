@@ -21,8 +21,10 @@ logger = logging.getLogger(__name__)
 class ExcelFileHandler(FileSystemEventHandler):
     """Handler for Excel file modification events."""
     
-    def __init__(self, callback):
+    def __init__(self, callback, loop: Optional[asyncio.AbstractEventLoop] = None):
         self.callback = callback
+        # Loop of the application; watchdog calls on_modified from its own thread
+        self._loop = loop
         self._last_modified = 0
         self._debounce_seconds = 1.0  # Debounce rapid changes
     
@@ -41,15 +43,11 @@ class ExcelFileHandler(FileSystemEventHandler):
         
         self._last_modified = now
         
-        # Schedule async callback
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.callback(event.src_path))
-            else:
-                loop.run_until_complete(self.callback(event.src_path))
-        except RuntimeError:
-            # No event loop - create new one
+        # Schedule async callback on the application loop (thread-safe)
+        if self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.callback(event.src_path), self._loop)
+        else:
+            # No application loop - run the callback in a fresh one
             asyncio.run(self.callback(event.src_path))
 
 
@@ -123,7 +121,11 @@ class ExcelWatcher:
         
         try:
             self._watch_path = watch_dir
-            handler = ExcelFileHandler(self._on_file_changed)
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            handler = ExcelFileHandler(self._on_file_changed, loop)
             
             self._observer = Observer()
             self._observer.schedule(handler, str(watch_dir), recursive=False)
@@ -88,36 +88,33 @@ class WebSocketManager:
         sent_count = 0
         disconnected = []
         
-        data = message.model_dump(mode='json')
+        # JSON-кодируем один раз на всех клиентов (send_json делал бы json.dumps для каждого)
+        text = message.model_dump_json()
 
         async def send_with_timeout(ws: WebSocket) -> bool:
             """Отправка с таймаутом 1 сек."""
             try:
                 if ws.client_state == WebSocketState.CONNECTED:
-                    await asyncio.wait_for(ws.send_json(data), timeout=1.0)
+                    await asyncio.wait_for(ws.send_text(text), timeout=1.0)
                     return True
             except (asyncio.TimeoutError, Exception):
                 return False
             return False
 
-        # Отправляем всем параллельно с таймаутом
-        tasks = []
-        for ws in connections:
-            if ws != exclude:
-                tasks.append((ws, asyncio.create_task(send_with_timeout(ws))))
-        
-        if not tasks:
+        targets = [ws for ws in connections if ws is not exclude]
+        if not targets:
             return 0
         
-        # Ждём все задачи (они уже с таймаутом внутри)
-        for ws, task in tasks:
-            try:
-                success = await task
-                if success:
-                    sent_count += 1
-                else:
-                    disconnected.append(ws)
-            except Exception:
+        # Отправляем всем параллельно с таймаутом
+        results = await asyncio.gather(
+            *(send_with_timeout(ws) for ws in targets),
+            return_exceptions=True
+        )
+        
+        for ws, success in zip(targets, results):
+            if success is True:
+                sent_count += 1
+            else:
                 disconnected.append(ws)
         
         # Чистим отключённых (без лока — atomic операция)
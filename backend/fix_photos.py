@@ -20,14 +20,24 @@ if not os.path.exists(images_dir):
 print("Starting photo database and files fix...")
 print("=" * 60)
 
-conn = sqlite3.connect(db_path)
+# Autocommit mode: the update transaction below is opened explicitly.
+# timeout=5.0 waits on a locked database (e.g. the running backend) instead of failing
+conn = sqlite3.connect(db_path, isolation_level=None, timeout=5.0)
+# Connection-only tuning for the bulk update (journal_mode is left alone:
+# WAL would persist in the application's database file)
+conn.executescript(
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-200000;"
+    "PRAGMA mmap_size=268435456;"
+)
 cursor = conn.cursor()
 
 # 1. Update paths in Database
 cursor.execute("SELECT id, name, photo_thumb, photo_full FROM profiles")
 rows = cursor.fetchall()
 
-db_updates = 0
+updates = []
 for row in rows:
     pid, name, thumb, full = row
     new_thumb = thumb
@@ -44,16 +54,24 @@ for row in rows:
         new_full = full.replace('static/', '')
         
     if new_thumb != thumb or new_full != full:
-        cursor.execute(
-            "UPDATE profiles SET photo_thumb = ?, photo_full = ? WHERE id = ?",
-            (new_thumb, new_full, pid)
-        )
-        db_updates += 1
+        updates.append((new_thumb, new_full, pid))
         print(f"Updated DB paths for [{name}] (ID: {pid}):")
         print(f"  thumb: {thumb} -> {new_thumb}")
         print(f"  full:  {full} -> {new_full}")
 
-conn.commit()
+# All path updates in one transaction with a single executemany.
+# BEGIN IMMEDIATE takes the write lock up front rather than mid-update
+cursor.execute("BEGIN IMMEDIATE")
+try:
+    cursor.executemany(
+        "UPDATE profiles SET photo_thumb = ?, photo_full = ? WHERE id = ?",
+        updates
+    )
+    cursor.execute("COMMIT")
+except Exception:
+    cursor.execute("ROLLBACK")
+    raise
+db_updates = len(updates)
 print(f"-> Successfully updated {db_updates} profiles in Database.")
 print("-" * 60)
 
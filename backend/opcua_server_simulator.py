@@ -1,11 +1,14 @@
 import asyncio
+import heapq
 import logging
 import sys
+import threading
 import time
 import tkinter as tk
 from tkinter import ttk, messagebox
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import json
 from pathlib import Path
 
@@ -17,6 +20,20 @@ logger = logging.getLogger("OPCUAServerSimulator")
 logger.setLevel(logging.INFO)
 logging.getLogger("asyncua").setLevel(logging.WARNING) # Suppress verbose asyncua logs
 
+# Один энкодер на весь процесс: компактный вывод без пробелов, кириллица как есть
+_CONFIG_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+# Переменные ванны и их типы OPC UA (порядок совпадает с кортежами состояния ванны)
+BATH_FIELDS = (
+    ('InUse', ua.VariantType.Boolean),
+    ('Free', ua.VariantType.Boolean),
+    ('Pallete', ua.VariantType.UInt32),
+    ('InTime', ua.VariantType.UInt32),
+    ('OutTime', ua.VariantType.UInt32),
+    ('dTime', ua.VariantType.UInt32),
+)
+EMPTY_BATH_STATE = (False, True, 0, 0, 0, 0)
+
 
 class SimulatorConfig:
     """Конфигурация симулятора"""
@@ -30,6 +47,7 @@ class SimulatorConfig:
         self.manual_transition_time = 30  # Время перехода для ручного режима
         self.recipes = {}  # База рецептов для вкладок: {"1": {"steps": [...], "transition_time": 30}, ...}
         self._next_id = 1
+        self._cached_recipe = None  # (ванны, времена) из manual_recipe, см. get_effective_recipe
         
     def get_next_id(self):
         """Получить следующий свободный ID и инкрементировать счетчик"""
@@ -40,20 +58,38 @@ class SimulatorConfig:
     def set_next_id(self, val):
         """Установить начальный ID (например, из GUI)"""
         self._next_id = max(self._next_id, val)
+
+    def get_effective_recipe(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Активные шаги manual_recipe как (ванны, времена); кешируется до invalidate_recipe()"""
+        if self._cached_recipe is None:
+            steps = [
+                (item['bath'], item['time']) for item in self.manual_recipe
+                if item.get('active') and item.get('bath', 0) > 0
+            ]
+            self._cached_recipe = (
+                tuple(bath for bath, _ in steps),
+                tuple(t for _, t in steps),
+            )
+        return self._cached_recipe
+
+    def invalidate_recipe(self):
+        """Сбросить кеш рецепта после изменения manual_recipe"""
+        self._cached_recipe = None
         
     def save(self, filepath: str = "simulator_config.json"):
         """Сохранить конфигурацию в файл"""
+        data = {
+            'hanger_spawn_interval': self.hanger_spawn_interval,
+            'bath_transition_time': self.bath_transition_time,
+            'bath_sequence': self.bath_sequence,
+            'time_in_bath': self.time_in_bath,
+            'max_hangers': self.max_hangers,
+            'manual_recipe': self.manual_recipe,
+            'manual_transition_time': self.manual_transition_time,
+            'recipes': self.recipes,
+        }
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump({
-                'hanger_spawn_interval': self.hanger_spawn_interval,
-                'bath_transition_time': self.bath_transition_time,
-                'bath_sequence': self.bath_sequence,
-                'time_in_bath': self.time_in_bath,
-                'max_hangers': self.max_hangers,
-                'manual_recipe': self.manual_recipe,
-                'manual_transition_time': self.manual_transition_time,
-                'recipes': self.recipes,
-            }, f, indent=2)
+            f.write(_CONFIG_ENCODER.encode(data))
     
     def _get_default_recipes(self):
         """Сгенерировать стандартные рецепты по умолчанию"""
@@ -111,6 +147,7 @@ class SimulatorConfig:
                 self.time_in_bath = data.get('time_in_bath', 120)
                 self.max_hangers = data.get('max_hangers', 10)
                 self.manual_recipe = data.get('manual_recipe', [])
+                self.invalidate_recipe()
                 self.manual_transition_time = data.get('manual_transition_time', 30)
                 self.manual_recipe_times = data.get('manual_recipe_times', [])
                 self.recipes = data.get('recipes', {})
@@ -192,6 +229,20 @@ class ToggleSwitch(tk.Canvas):
                          fill=thumb_color, outline="")
 
 
+class HangerCard:
+    """Виджеты карточки подвеса в панели мониторинга"""
+    __slots__ = ('frame', 'state_lbl', 'time_lbl', 'dur_var', 'last_state', 'route_frame', 'expanded')
+
+    def __init__(self, frame, state_lbl, time_lbl, dur_var, route_frame):
+        self.frame = frame
+        self.state_lbl = state_lbl
+        self.time_lbl = time_lbl
+        self.dur_var = dur_var
+        self.last_state = None
+        self.route_frame = route_frame
+        self.expanded = False
+
+
 class ManualHangerWindow:
     """Окно для запуска подвесов вручную в ручном режиме"""
     def __init__(self, manual_queue, config=None, hangers=None):
@@ -208,12 +259,16 @@ class ManualHangerWindow:
         self.time_saved_values = [30] * 7
         self.transition_saved_value = 30
         self.should_exit = False
-        self.monitor_items = {}  # {hanger_id: monitor_widgets_dict}
+        self.sim_error = None  # Ошибка, остановившая поток симуляции (ставится из потока asyncio)
+        self.monitor_items = {}  # {hanger_id: HangerCard}
         self.last_update = 0
         self.monitor_canvas = None
         self.monitor_scrollable = None
         self._root_after_handle = None
         self.auto_spawn_var = None
+        self.auto_spawn = threading.Event()  # Зеркало auto_spawn_var для потока asyncio
+        self._pending_hanger_id = None  # Следующий номер после автозапуска (ставится из потока asyncio)
+        self.rescheduled = deque()  # ID подвесов, чьи сроки изменены из GUI (перепланирует asyncio)
         self.spawn_interval_var = None
         self.active_recipe_tab = "1"
         self.tab_buttons = {}
@@ -226,6 +281,7 @@ class ManualHangerWindow:
         
         # Слушатель для обновления интервала в конфиге в реальном времени
         self.spawn_interval_var.trace_add("write", self._on_interval_change)
+        self.auto_spawn_var.trace_add("write", self._on_auto_spawn_change)
         self.root.title("OPC UA Simulator - ПУЛЬТ УПРАВЛЕНИЯ")
         
         # Центрирование окна
@@ -377,9 +433,18 @@ class ManualHangerWindow:
 
     def _update_loop(self):
         """Регулярное обновление мониторинга"""
-        if self.should_exit: return
+        if self.should_exit:
+            # Поток симуляции остановился сам - сообщаем оператору и закрываем пульт
+            if self.sim_error is not None:
+                messagebox.showerror("Ошибка симуляции", f"Симуляция остановлена:\n{self.sim_error}")
+            self.root.destroy()
+            return
         
         try:
+            pending_id = self._pending_hanger_id
+            if pending_id is not None:
+                self._pending_hanger_id = None
+                self.hanger_id_var.set(pending_id)
             self._do_update_monitoring()
         except Exception as e:
             logger.error(f"Error in UI update loop: {e}")
@@ -390,21 +455,16 @@ class ManualHangerWindow:
         """Обновить список карточек подвесов"""
         if not self.root: return
         
-        active_ids = list(self.hangers.keys())
-        
         # Удаляем карточки завершенных подвесов
-        for h_id in list(self.monitor_items.keys()):
-            if h_id not in active_ids:
-                self.monitor_items[h_id]['frame'].destroy()
-                del self.monitor_items[h_id]
-        
-        # Добавляем/обновляем карточки активных
-        for h_id in active_ids:
-            hanger = self.hangers[h_id]
-            
+        stale = [h_id for h_id in self.monitor_items if h_id not in self.hangers]
+        for h_id in stale:
+            self.monitor_items.pop(h_id).frame.destroy()
+
+        # Добавляем/обновляем карточки активных (снимок — словарь меняется в потоке симуляции)
+        for h_id, hanger in list(self.hangers.items()):
             if h_id not in self.monitor_items:
                 self._create_hanger_card(h_id)
-            
+
             self._update_hanger_card(h_id, hanger)
 
 
@@ -415,6 +475,7 @@ class ManualHangerWindow:
             try:
                 val = int(var.get())
                 self.hangers[h_id].set_duration(val)
+                self.rescheduled.append(h_id)
             except ValueError:
                 messagebox.showerror("Ошибка", "Введите целое число!")
 
@@ -430,6 +491,17 @@ class ManualHangerWindow:
 
 
 
+    def _on_auto_spawn_change(self, *args):
+        """Передать состояние переключателя автозапуска в поток asyncio"""
+        if self.auto_spawn_var.get():
+            self.auto_spawn.set()
+        else:
+            self.auto_spawn.clear()
+
+    def notify_auto_spawn(self, h_id):
+        """Вызывается из потока asyncio: предложить следующий номер в GUI"""
+        self._pending_hanger_id = h_id + 1
+
     def _create_hanger_card(self, h_id):
         """Создать карточку для нового подвеса"""
         card = ttk.LabelFrame(self.monitor_scrollable, text=f"Подвес №{h_id}", style="Hanger.TLabelframe")
@@ -470,35 +542,26 @@ class ManualHangerWindow:
         route_frame = ttk.Frame(card)
         # Пока не пакуем
         
-        self.monitor_items[h_id] = {
-            'frame': card,
-            'state_lbl': state_lbl,
-            'time_lbl': time_lbl,
-            'dur_var': dur_var,
-            'last_state': None,
-            'route_frame': route_frame,
-            'expanded': False
-        }
+        self.monitor_items[h_id] = HangerCard(card, state_lbl, time_lbl, dur_var, route_frame)
 
     def _toggle_route(self, h_id):
         """Развернуть/свернуть детализацию маршрута"""
         item = self.monitor_items.get(h_id)
         if not item: return
         
-        if item['expanded']:
-            item['route_frame'].pack_forget()
-            item['expanded'] = False
+        if item.expanded:
+            item.route_frame.pack_forget()
+            item.expanded = False
         else:
-            item['route_frame'].pack(fill=tk.X, pady=5)
-            item['expanded'] = True
+            item.route_frame.pack(fill=tk.X, pady=5)
+            item.expanded = True
             # Сразу обновляем список при открытии
             if h_id in self.hangers:
                 self._refresh_route_list(h_id, self.hangers[h_id])
 
     def _refresh_route_list(self, h_id, hanger):
         """Отрисовать список ванн маршрута"""
-        item = self.monitor_items[h_id]
-        frame = item['route_frame']
+        frame = self.monitor_items[h_id].route_frame
         
         for widget in frame.winfo_children():
             widget.destroy()
@@ -531,33 +594,37 @@ class ManualHangerWindow:
     def _update_hanger_card(self, h_id, hanger):
         """Обновить данные в карточке"""
         item = self.monitor_items[h_id]
+        state = hanger.state
+        in_bath = state == 'in_bath'
+        
+        status = "ВАННА " + str(hanger.current_bath) if in_bath else "ПЕРЕХОД..."
+        item.state_lbl.config(text=f"Статус: {status}")
         
-        status = "ВАННА " + str(hanger.current_bath) if hanger.state == 'in_bath' else "ПЕРЕХОД..."
-        item['state_lbl'].config(text=f"Статус: {status}")
+        total_needed = hanger.get_bath_time() if in_bath else hanger.transition_time
         
         # Обновляем поле ввода при смене состояния
-        current_state_key = f"{hanger.state}_{hanger.current_bath_index}"
-        if item['last_state'] != current_state_key:
-            total_needed = hanger.get_bath_time() if hanger.state == 'in_bath' else hanger.transition_time
-            item['dur_var'].set(str(total_needed))
-            item['last_state'] = current_state_key
+        current_state_key = (state, hanger.current_bath_index)
+        if item.last_state != current_state_key:
+            item.dur_var.set(str(total_needed))
+            item.last_state = current_state_key
             # Если развернуто, обновляем список ванн при смене состояния
-            if item['expanded']:
+            if item.expanded:
                 self._refresh_route_list(h_id, hanger)
 
-        total_needed = hanger.get_bath_time() if hanger.state == 'in_bath' else hanger.transition_time
         left = max(0, total_needed - hanger.elapsed_time)
         
         color = "red" if left < 10 else "black"
-        item['time_lbl'].config(text=f"Осталось: {left} сек", foreground=color)
+        item.time_lbl.config(text=f"Осталось: {left} сек", foreground=color)
 
     def _adjust_hanger_time(self, h_id, seconds):
         if h_id in self.hangers:
             self.hangers[h_id].adjust_time(seconds)
+            self.rescheduled.append(h_id)
 
     def _skip_hanger(self, h_id):
         if h_id in self.hangers:
             self.hangers[h_id].force_next_state()
+            self.rescheduled.append(h_id)
 
     def _delete_hanger(self, h_id):
         if h_id in self.hangers:
@@ -567,6 +634,7 @@ class ManualHangerWindow:
                 # или просто пометим его как завершенный.
                 # Самый простой способ - форсировать индекс до конца.
                 self.hangers[h_id].current_bath_index = len(self.hangers[h_id].bath_sequence) + 1
+                self.rescheduled.append(h_id)
                 logger.warning(f"[DELETE] Hanger {h_id} marked for deletion via GUI")
 
     def _on_launch(self):
@@ -617,6 +685,8 @@ class ManualHangerWindow:
     def _on_exit(self):
         self._save_recipe()
         self.should_exit = True
+        if self._root_after_handle is not None:
+            self.root.after_cancel(self._root_after_handle)
         self.root.destroy()
 
     def _update_row_active(self, idx):
@@ -727,6 +797,14 @@ class HangerState:
         """Подвес завершил маршрут"""
         return self.current_bath_index >= len(self.bath_sequence)
     
+    @property
+    def deadline(self) -> float:
+        """Момент (timestamp) следующей смены состояния; 0 - маршрут завершен"""
+        if self.is_finished:
+            return 0.0
+        duration = self.get_bath_time() if self.state == 'in_bath' else self.transition_time
+        return self.state_start_time.timestamp() + duration
+    
     def get_bath_time(self) -> int:
         """Получить время в текущей ванне"""
         return self.time_in_bath
@@ -831,14 +909,17 @@ class HangerStateManual(HangerState):
         return False
 
 
-async def run_opcua_server_simulation(config: SimulatorConfig):
+async def run_opcua_server_simulation(config: SimulatorConfig, manual_window: ManualHangerWindow):
     """
     Runs an OPC UA server simulation matching the real Omron PLC structure.
     Creates nodes in namespace 4 to match the real server.
     
+    Runs on a worker thread; the Tk GUI owns the main thread and talks to
+    this loop only through manual_window's deque, Event and flags.
+    
     Args:
         config: Simulator configuration
-        manual_mode: If True, allows manual hanger launches via GUI
+        manual_window: Control panel window (shared hangers and launch queue)
     """
     server = Server()
     
@@ -868,55 +949,66 @@ async def run_opcua_server_simulation(config: SimulatorConfig):
     # Get the standard OPC UA object node
     objects = server.get_objects_node()
     
-    # Create Bath array structure (40 baths as expected by the client)
-    bath_vars = {}
-    for bath_num in range(1, 41):
-        bath_node_id = ua.NodeId(f"Bath[{bath_num}]", idx)
-        bath_obj = await objects.add_object(bath_node_id, f"Bath[{bath_num}]")
-        
-        bath_vars[bath_num] = {
-            'InUse': await bath_obj.add_variable(
-                ua.NodeId(f"Bath[{bath_num}].InUse", idx), "InUse", False, varianttype=ua.VariantType.Boolean
-            ),
-            'Free': await bath_obj.add_variable(
-                ua.NodeId(f"Bath[{bath_num}].Free", idx), "Free", True, varianttype=ua.VariantType.Boolean
-            ),
-            'Pallete': await bath_obj.add_variable(
-                ua.NodeId(f"Bath[{bath_num}].Pallete", idx), "Pallete", 0, varianttype=ua.VariantType.UInt32
-            ),
-            'InTime': await bath_obj.add_variable(
-                ua.NodeId(f"Bath[{bath_num}].InTime", idx), "InTime", 0, varianttype=ua.VariantType.UInt32
-            ),
-            'OutTime': await bath_obj.add_variable(
-                ua.NodeId(f"Bath[{bath_num}].OutTime", idx), "OutTime", 0, varianttype=ua.VariantType.UInt32
-            ),
-            'dTime': await bath_obj.add_variable(
-                ua.NodeId(f"Bath[{bath_num}].dTime", idx), "dTime", 0, varianttype=ua.VariantType.UInt32
-            ),
-        }
+    # Create Bath array structure (40 baths as expected by the client).
+    # Independent node operations are issued together via asyncio.gather.
+    bath_nums = range(1, 41)
+    bath_objs = await asyncio.gather(*(
+        objects.add_object(ua.NodeId(f"Bath[{bath_num}]", idx), f"Bath[{bath_num}]")
+        for bath_num in bath_nums
+    ))
+    
+    # String NodeIds (ns=4;s=Bath[N].Field) must match the real PLC - the backend reads them by name
+    field_names = [name for name, _ in BATH_FIELDS]
+    bath_field_vars = await asyncio.gather(*(
+        bath_obj.add_variable(
+            ua.NodeId(f"Bath[{bath_num}].{name}", idx), name, initial, varianttype=vtype
+        )
+        for bath_num, bath_obj in zip(bath_nums, bath_objs)
+        for (name, vtype), initial in zip(BATH_FIELDS, EMPTY_BATH_STATE)
+    ))
+    n_fields = len(BATH_FIELDS)
+    bath_vars = {
+        bath_num: dict(zip(field_names, bath_field_vars[i * n_fields:(i + 1) * n_fields]))
+        for i, bath_num in enumerate(bath_nums)
+    }
     
     # Add power supply status variables
     power_node_id = ua.NodeId("S8VK_X", idx)
     power_obj = await objects.add_object(power_node_id, "S8VK_X")
-    power_vars = {
-        'Status': await power_obj.add_variable(
-            ua.NodeId("S8VK_X.Status", idx), "Status", True, varianttype=ua.VariantType.Boolean
-        ),
-        'Voltage': await power_obj.add_variable(
-            ua.NodeId("S8VK_X.Voltage", idx), "Voltage", 24.0, varianttype=ua.VariantType.Float
-        ),
-        'Current': await power_obj.add_variable(
-            ua.NodeId("S8VK_X.Current", idx), "Current", 5.0, varianttype=ua.VariantType.Float
-        ),
-    }
+    power_fields = (
+        ('Status', True, ua.VariantType.Boolean),
+        ('Voltage', 24.0, ua.VariantType.Float),
+        ('Current', 5.0, ua.VariantType.Float),
+    )
+    power_vars = dict(zip(
+        (name for name, _, _ in power_fields),
+        await asyncio.gather(*(
+            power_obj.add_variable(ua.NodeId(f"S8VK_X.{name}", idx), name, initial, varianttype=vtype)
+            for name, initial, vtype in power_fields
+        )),
+    ))
     
     # Make all variables writable
-    for bath_num in range(1, 41):
-        for var in bath_vars[bath_num].values():
-            await var.set_writable()
+    await asyncio.gather(
+        *(var.set_writable() for var in bath_field_vars),
+        *(var.set_writable() for var in power_vars.values()),
+    )
     
-    for var in power_vars.values():
-        await var.set_writable()
+    # Готовые шаблоны WriteValue (NodeId + AttributeId) для каждого поля ванны;
+    # в цикле меняется только Value
+    bath_write_tmpl = {}
+    for bath_num, fields in bath_vars.items():
+        templates = []
+        for name, vtype in BATH_FIELDS:
+            tmpl = ua.WriteValue()
+            tmpl.NodeId = fields[name].nodeid
+            tmpl.AttributeId = ua.AttributeIds.Value
+            templates.append((tmpl, vtype))
+        bath_write_tmpl[bath_num] = templates
+    # Последнее записанное состояние каждой ванны (совпадает с начальными значениями узлов)
+    prev_bath_state = dict.fromkeys(bath_write_tmpl, EMPTY_BATH_STATE)
+    # Заранее связанные конструкторы для горячего цикла записи
+    DataValue, Variant = ua.DataValue, ua.Variant
     
     logger.info("All variables created and configured")
 
@@ -925,55 +1017,44 @@ async def run_opcua_server_simulation(config: SimulatorConfig):
     logger.info("OPC UA Server started and ready!")
     
     # Simulation state
-    hangers: Dict[int, HangerState] = {}  # {hanger_id: HangerState}
-    last_spawn_time = datetime.now() - timedelta(minutes=10) # Сразу готовы к спавну
+    loop = asyncio.get_running_loop()
+    hangers: Dict[int, HangerState] = manual_window.hangers  # {hanger_id: HangerState}
+    last_spawn_time = loop.time() - 600  # Сразу готовы к спавну
     last_auto_mode = False
-    manual_queue: List[Dict] = []  # Queue for manually-launched hangers
-    
-    # Всегда запускаем GUI окно (Пульт Управления)
-    manual_window = ManualHangerWindow(manual_queue, config, hangers)
-    
-    # Запускаем GUI в отдельном потоке
-    import threading
-    gui_thread = threading.Thread(target=manual_window.show, daemon=True)
-    gui_thread.start()
-    
-    logger.info("[GUI] Unified Control Panel GUI started")
+    manual_queue: deque = manual_window.manual_queue  # Queue for manually-launched hangers
+    rescheduled: deque = manual_window.rescheduled  # Hangers edited from the GUI
+    # Min-heap of (deadline, hanger_id): hangers are touched only when their state is due.
+    # Entries whose deadline no longer matches the hanger are stale and skipped.
+    wakeups: List[Tuple[float, int]] = []
     
+    next_tick = loop.time()
     try:
         while True:
             # Проверяем флаг выхода
-            if manual_window and manual_window.should_exit:
+            if manual_window.should_exit:
                 logger.info("[STOP] Exiting from manual mode")
                 break
             
-            current_time = datetime.now()
+            current_time = loop.time()  # монотонные секунды, дешевле datetime.now()
             
             # 1. Смена режима: проверяем галочку в GUI
-            auto_mode_active = False
-            if manual_window.auto_spawn_var:
-                auto_mode_active = manual_window.auto_spawn_var.get()
+            auto_mode_active = manual_window.auto_spawn.is_set()
             
             # Если только что включили автозапуск - сбрасываем таймер для мгновенного первого спавна
             if auto_mode_active and not last_auto_mode:
-                last_spawn_time = datetime.now() - timedelta(seconds=config.hanger_spawn_interval + 1)
+                last_spawn_time = current_time - (config.hanger_spawn_interval + 1)
             last_auto_mode = auto_mode_active
             
             # 1a. Auto-spawn new hanger if needed
             if auto_mode_active and len(hangers) < config.max_hangers:
-                if (current_time - last_spawn_time).total_seconds() >= config.hanger_spawn_interval:
+                if current_time - last_spawn_time >= config.hanger_spawn_interval:
                     # Используем централизованный ID из конфига
                     h_id = config.get_next_id()
                     # Синхронизируем GUI
-                    manual_window.hanger_id_var.set(h_id + 1)
+                    manual_window.notify_auto_spawn(h_id)
                     
-                    # Получаем рецепт из текущих настроек (поля GUI, сохраненные в конфиг)
-                    baths = []
-                    times = []
-                    for item in config.manual_recipe:
-                        if item.get('active') and item.get('bath', 0) > 0:
-                            baths.append(item['bath'])
-                            times.append(item['time'])
+                    # Получаем рецепт из текущих настроек (кешируется в конфиге)
+                    baths, times = config.get_effective_recipe()
                     
                     if not baths:
                         # Резервный вариант, если рецепт не задан
@@ -983,15 +1064,17 @@ async def run_opcua_server_simulation(config: SimulatorConfig):
                         hanger = HangerState(h_id, baths, config.time_in_bath, trans)
                     else:
                         trans = config.manual_transition_time
-                        hanger = HangerStateManual(h_id, baths, times, trans)
+                        # Копии: подвес может менять свои времена из GUI (set_duration)
+                        hanger = HangerStateManual(h_id, list(baths), list(times), trans)
 
                     hangers[h_id] = hanger
+                    heapq.heappush(wakeups, (hanger.deadline, h_id))
                     logger.info(f"[START] (Auto) Spawned hanger {h_id}, using GUI recipe: {baths}")
                     last_spawn_time = current_time
             
-            # 1b. Manual mode: check for manual launches from queue
-            if manual_queue:
-                hanger_data = manual_queue.pop(0)
+            # 1b. Manual mode: drain queued launches up to max_hangers (the rest wait in the queue)
+            while manual_queue and len(hangers) < config.max_hangers:
+                hanger_data = manual_queue.popleft()
                 hanger_id = hanger_data['hanger_id']
                 bath_sequence = hanger_data['bath_sequence']
                 time_in_bath_list = hanger_data['time_in_bath_list']
@@ -1005,60 +1088,91 @@ async def run_opcua_server_simulation(config: SimulatorConfig):
                     transition_time
                 )
                 hangers[hanger_id] = hanger
+                heapq.heappush(wakeups, (hanger.deadline, hanger_id))
                 logger.info(f"[LAUNCH] Manual launch: Hanger {hanger_id}, baths {bath_sequence}, times {time_in_bath_list}s")
             
-            # 2. Update all hangers
-            finished_hangers = []
-            for hanger_id, hanger in hangers.items():
+            # 2. Advance only hangers whose deadline has passed (plus ones edited in the GUI)
+            while rescheduled:
+                hanger_id = rescheduled.popleft()
+                hanger = hangers.get(hanger_id)
+                if hanger is not None:
+                    heapq.heappush(wakeups, (hanger.deadline, hanger_id))
+            
+            now_ts = time.time()
+            due = []
+            while wakeups and wakeups[0][0] <= now_ts:
+                due.append(heapq.heappop(wakeups))
+            
+            for deadline, hanger_id in due:
+                hanger = hangers.get(hanger_id)
+                if hanger is None or hanger.deadline != deadline:
+                    continue  # stale entry: hanger removed or rescheduled
                 hanger.update()
                 
+                # 3. Remove finished hangers, reschedule the rest
                 if hanger.is_finished:
-                    finished_hangers.append(hanger_id)
+                    del hangers[hanger_id]
                     logger.info(f"[OK] Hanger {hanger_id} completed the route")
+                else:
+                    heapq.heappush(wakeups, (hanger.deadline, hanger_id))
             
-            # 3. Remove finished hangers
-            for hanger_id in finished_hangers:
-                del hangers[hanger_id]
+            in_bath = [
+                (hanger_id, hanger) for hanger_id, hanger in list(hangers.items())
+                if hanger.state == 'in_bath' and hanger.current_bath
+            ]
             
-            # 4. Clear all baths first
-            for bath_num in range(1, 41):
-                await bath_vars[bath_num]['InUse'].write_value(False)
-                await bath_vars[bath_num]['Free'].write_value(True)
-                await bath_vars[bath_num]['Pallete'].write_value(ua.Variant(0, ua.VariantType.UInt32))
-                await bath_vars[bath_num]['InTime'].write_value(ua.Variant(0, ua.VariantType.UInt32))
-                await bath_vars[bath_num]['OutTime'].write_value(ua.Variant(0, ua.VariantType.UInt32))
-                await bath_vars[bath_num]['dTime'].write_value(ua.Variant(0, ua.VariantType.UInt32))
+            # 4. Build bath state for this tick (all baths start empty)
+            bath_state = dict.fromkeys(bath_write_tmpl, EMPTY_BATH_STATE)
+            for hanger_id, hanger in in_bath:
+                bath_num = hanger.current_bath
+                
+                # Check if bath is already occupied
+                current_pallete = bath_state[bath_num][2]
+                if current_pallete != 0:
+                    # Bath is already occupied, skip this hanger (shouldn't happen in normal operation)
+                    logger.warning(f"[WARNING] Bath {bath_num} already occupied by hanger {current_pallete}, skipping hanger {hanger_id}")
+                    continue
+                
+                bath_time = hanger.get_bath_time()
+                bath_state[bath_num] = (True, False, hanger.hanger_id, hanger.elapsed_time, bath_time, bath_time)
             
-            # 5. Update baths with current hangers
-            for hanger_id, hanger in hangers.items():
-                if hanger.state == 'in_bath' and hanger.current_bath:
-                    bath_num = hanger.current_bath
-                    
-                    # Check if bath is already occupied
-                    current_pallete = await bath_vars[bath_num]['Pallete'].read_value()
-                    if current_pallete != 0:
-                        # Bath is already occupied, skip this hanger (shouldn't happen in normal operation)
-                        logger.warning(f"[WARNING] Bath {bath_num} already occupied by hanger {current_pallete}, skipping hanger {hanger_id}")
-                        continue
-                    
-                    elapsed = hanger.elapsed_time
-                    
-                    await bath_vars[bath_num]['InUse'].write_value(True)
-                    await bath_vars[bath_num]['Free'].write_value(False)
-                    await bath_vars[bath_num]['Pallete'].write_value(ua.Variant(hanger.hanger_id, ua.VariantType.UInt32))
-                    await bath_vars[bath_num]['InTime'].write_value(ua.Variant(elapsed, ua.VariantType.UInt32))
-                    await bath_vars[bath_num]['OutTime'].write_value(ua.Variant(hanger.get_bath_time(), ua.VariantType.UInt32))
-                    await bath_vars[bath_num]['dTime'].write_value(ua.Variant(hanger.get_bath_time(), ua.VariantType.UInt32))
+            # 5. Write only baths whose state changed, in a single Write service call
+            params = ua.WriteParameters()
+            add_write = params.NodesToWrite.append
+            written_baths = []  # Номер ванны для каждого элемента NodesToWrite
+            for bath_num, values in bath_state.items():
+                if prev_bath_state[bath_num] == values:
+                    continue
+                prev_bath_state[bath_num] = values
+                for (tmpl, vtype), value in zip(bath_write_tmpl[bath_num], values):
+                    # Без SourceTimestamp: клиент читает только значения, метки времени не нужны
+                    tmpl.Value = DataValue(Variant(value, vtype))
+                    add_write(tmpl)
+                    written_baths.append(bath_num)
+            if params.NodesToWrite:
+                results = await server.iserver.isession.write(params)
+                for wv, bath_num, status in zip(params.NodesToWrite, written_baths, results):
+                    if not status.is_good():
+                        # Ошибка записи одной переменной не останавливает симуляцию;
+                        # сбрасываем теневое состояние, чтобы ванна перезаписалась на следующем такте
+                        logger.warning(f"[WARNING] Write to {wv.NodeId.to_string()} failed: {status.name}")
+                        prev_bath_state[bath_num] = None
             
             # 6. Log status every 10 seconds
-            if int(current_time.timestamp()) % 10 == 0:
+            if int(current_time) % 10 == 0:
                 active_hangers = [f"{h.hanger_id}@Bath{h.current_bath}" 
                                  for h in hangers.values() if h.state == 'in_bath']
                 transitioning = [f"{h.hanger_id}→" 
                                 for h in hangers.values() if h.state == 'transitioning']
                 logger.info(f"[STATUS] Active: {len(hangers)} hangers | In baths: {active_hangers} | Moving: {transitioning}")
             
-            await asyncio.sleep(1)  # Update every second
+            # Фиксированный шаг 1с по монотонным часам (без накопления дрейфа)
+            next_tick += 1.0
+            lag = loop.time() - next_tick
+            if lag > 0.5:
+                logger.warning(f"[WARNING] Tick overrun by {lag:.2f}s, resyncing")
+                next_tick = loop.time()
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
             
     finally:
         logger.info("Stopping OPC UA Server...")
@@ -1066,16 +1180,38 @@ async def run_opcua_server_simulation(config: SimulatorConfig):
         logger.info("OPC UA Server stopped.")
 
 
+def _run_simulation_thread(config: SimulatorConfig, manual_window: ManualHangerWindow):
+    """Поток asyncio: OPC UA сервер и симуляция (Tk остается в главном потоке)"""
+    try:
+        asyncio.run(run_opcua_server_simulation(config, manual_window))
+    except Exception as e:
+        logger.exception(f"Fatal error: {e}")
+        manual_window.sim_error = e
+    finally:
+        # Без сервера пульт бесполезен: _update_loop закроет окно в потоке Tk
+        manual_window.should_exit = True
+
+
 if __name__ == "__main__":
     # Load configuration
     config = SimulatorConfig()
     config.load()
     
+    # Пульт управления живет в главном потоке, asyncio - в рабочем
+    # deque: append (GUI) и popleft (asyncio) атомарны в CPython
+    manual_window = ManualHangerWindow(deque(), config, {})
+    sim_thread = threading.Thread(
+        target=_run_simulation_thread, args=(config, manual_window), daemon=True
+    )
+    
     # Run simulator with configuration
     try:
         logger.info("[START] Starting unified simulator with GUI")
-        asyncio.run(run_opcua_server_simulation(config))
+        sim_thread.start()
+        manual_window.show()
     except KeyboardInterrupt:
         logger.info("Simulator stopped by user (Ctrl+C)")
-    except Exception as e:
-        logger.exception(f"Fatal error: {e}")
+    finally:
+        # Сигнал циклу симуляции и ожидание корректной остановки сервера
+        manual_window.should_exit = True
+        sim_thread.join(timeout=5)
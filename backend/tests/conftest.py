@@ -1,13 +1,16 @@
 """
 Pytest configuration and fixtures
 """
+import asyncio
+import os
 import sys
 from pathlib import Path
 
 import pytest
 import pytest_asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # Add backend to path for imports
 backend_path = Path(__file__).parent.parent
@@ -15,26 +18,64 @@ sys.path.insert(0, str(backend_path))
 
 from app.db.base import Base
 
+# Built once; each test binds it to its own connection
+_session_factory = async_sessionmaker(
+    expire_on_commit=False,
+    join_transaction_mode="create_savepoint",
+)
 
-@pytest_asyncio.fixture
-async def db_session():
-    """Create a test database session."""
-    # Use in-memory SQLite for tests
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop (as uvicorn[standard] does in production) when UVLOOP=1."""
+    if os.getenv("UVLOOP") == "1":
+        try:
+            import uvloop
+            return uvloop.EventLoopPolicy()
+        except ImportError:
+            pass
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def db_engine():
+    """Create the in-memory test database and its schema once per test run."""
+    # StaticPool keeps a single connection, so the in-memory database survives
     engine = create_async_engine(
         "sqlite+aiosqlite:///:memory:",
-        echo=False
+        echo=False,
+        poolclass=StaticPool,
     )
-    
+
+    # Let SQLAlchemy own BEGIN/SAVEPOINT (the sqlite driver's implicit transactions
+    # would otherwise break the per-test rollback in db_session)
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # Create tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    
-    # Create session
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    
-    async with async_session() as session:
-        yield session
-    
+
+    yield engine
+
     await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def db_session(db_engine):
+    """
+    Create a test database session.
+
+    The session joins an outer transaction that is rolled back after the test,
+    so commits inside the test only release a savepoint and leave no data behind.
+    """
+    async with db_engine.connect() as conn:
+        trans = await conn.begin()
+        async with _session_factory(bind=conn) as session:
+            yield session
+        await trans.rollback()
@@ -7,6 +7,7 @@ from datetime import datetime, time
 from pathlib import Path
 from dotenv import load_dotenv
 import openpyxl
+from python_calamine import CalamineWorkbook
 from asyncua import Server, ua
 
 # Настройка логирования в консоль и в файл
@@ -70,6 +71,24 @@ def get_excel_path() -> Path:
     logger.info(f"Итоговый путь к Excel: {excel_path}")
     return excel_path
 
+def _read_hangers_sheet(excel_path: Path) -> list[list] | None:
+    """
+    Читает лист 'Подвесы' через calamine (Rust) вместо openpyxl read_only.
+    Строки адресуются от A1 (индекс 0 = строка 1); None, если листа нет.
+    """
+    wb = CalamineWorkbook.from_path(str(excel_path))
+    if "Подвесы" not in wb.sheet_names:
+        return None
+    return wb.get_sheet_by_name("Подвесы").to_python(skip_empty_area=False)
+
+def _cell(value):
+    """Приводит значение calamine к виду openpyxl: '' -> None, 16.0 -> 16."""
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
 def load_real_templates(excel_path: Path) -> list[dict]:
     """
     Загружает реальные записи (не мусор от симулятора) из начала Excel файла
@@ -80,16 +99,14 @@ def load_real_templates(excel_path: Path) -> list[dict]:
         return templates
         
     try:
-        wb = openpyxl.load_workbook(excel_path, read_only=True)
-        if "Подвесы" not in wb.sheetnames:
-            wb.close()
+        rows = _read_hangers_sheet(excel_path)
+        if rows is None:
             return templates
-            
-        ws = wb["Подвесы"]
         
         # Считываем первые 500 строк в поисках реальных данных
-        for row in ws.iter_rows(min_row=4, max_row=500, max_col=20, values_only=True):
+        for row in rows[3:500]:
             if len(row) >= 20:
+                row = [_cell(v) for v in row[:20]]
                 val_d = row[3]  # D (Дата)
                 val_e = row[4]  # E (Номер)
                 client = row[11] # L (Клиент)
@@ -107,7 +124,6 @@ def load_real_templates(excel_path: Path) -> list[dict]:
                             "color": row[16],            # Q
                             "lamels_qty": row[19]        # T
                         })
-        wb.close()
     except Exception as e:
         logger.error(f"Ошибка загрузки шаблонов из Excel: {e}")
         
@@ -134,24 +150,21 @@ def get_last_hanger_and_next_row(excel_path: Path) -> tuple[int, int]:
         return 799, 4
         
     try:
-        # Открываем в read_only режиме для быстрого чтения большого файла
-        wb = openpyxl.load_workbook(excel_path, read_only=True)
-        if "Подвесы" not in wb.sheetnames:
+        # Читаем лист через calamine: в разы быстрее openpyxl на большом файле
+        rows = _read_hangers_sheet(excel_path)
+        if rows is None:
             logger.error(f"Лист 'Подвесы' не найден в {excel_path}. Используем дефолтные параметры.")
-            wb.close()
             return 799, 4
-            
-        ws = wb["Подвесы"]
         
         last_hanger_id = 799
         row_index = 4
         
-        # Сканируем строки последовательно, начиная со 4-й (min_row=4)
-        for r_idx, row in enumerate(ws.iter_rows(min_row=4, max_col=5, values_only=True), start=4):
-            # В кортеже row: col D - индекс 3, col E - индекс 4
+        # Сканируем строки последовательно, начиная со 4-й
+        for r_idx, row in enumerate(rows[3:], start=4):
+            # В строке row: col D - индекс 3, col E - индекс 4
             if len(row) >= 5:
-                val_d = row[3] # D
-                val_e = row[4] # E
+                val_d = _cell(row[3]) # D
+                val_e = _cell(row[4]) # E
                 if val_d is None and val_e is None:
                     row_index = r_idx
                     break
@@ -164,8 +177,7 @@ def get_last_hanger_and_next_row(excel_path: Path) -> tuple[int, int]:
             else:
                 row_index = r_idx
                 break
-            
-        wb.close()
+        
         logger.info(f"Сканирование Excel завершено. Последний подвес: {last_hanger_id}, следующая строка для записи: {row_index}")
         return last_hanger_id, row_index
     except Exception as e:
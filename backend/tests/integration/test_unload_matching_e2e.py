@@ -73,7 +73,7 @@ def _setup_excel(filepath: Path):
 
     excel_service._active_file_name = str(filepath)
     excel_service._cache = None
-    excel_service._cache_mtime = None
+    excel_service._cache_stat = None
     excel_service._cache_path = None
 
 
@@ -99,7 +99,7 @@ def _save_state() -> dict:
     return {
         "active_file": excel_service._active_file_name,
         "cache": excel_service._cache,
-        "cache_mtime": excel_service._cache_mtime,
+        "cache_stat": excel_service._cache_stat,
         "cache_path": excel_service._cache_path,
         "connected": opcua_service._connected,
         "opcua_cache": opcua_service._cache.copy(),
@@ -117,7 +117,7 @@ def _restore_state(state: dict):
 
     excel_service._active_file_name = state["active_file"]
     excel_service._cache = state["cache"]
-    excel_service._cache_mtime = state["cache_mtime"]
+    excel_service._cache_stat = state["cache_stat"]
     excel_service._cache_path = state["cache_path"]
 
     opcua_service._connected = state["connected"]
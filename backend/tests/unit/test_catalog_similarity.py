@@ -0,0 +1,83 @@
+"""
+Unit tests for catalog search scoring (match priority, fuzzy similarity)
+"""
+from types import SimpleNamespace
+
+import pytest
+from app.services.catalog_service import CatalogService
+
+
+@pytest.fixture(scope="module")
+def catalog_service():
+    """Stateless service - one instance serves the whole module"""
+    return CatalogService()
+
+
+class TestCalculateSimilarity:
+    """Tests for CatalogService._calculate_similarity"""
+
+    def test_identical_strings(self, catalog_service):
+        """Identical strings (case-insensitive) score 1.0"""
+        assert catalog_service._calculate_similarity("алс345", "алс345") == 1.0
+        assert catalog_service._calculate_similarity("ALS", "als") == 1.0
+
+    def test_empty_input(self, catalog_service):
+        """Empty or None input scores 0.0"""
+        assert catalog_service._calculate_similarity("", "алс345") == 0.0
+        assert catalog_service._calculate_similarity("алс345", "") == 0.0
+        assert catalog_service._calculate_similarity(None, "алс345") == 0.0
+
+    def test_disjoint_strings(self, catalog_service):
+        """Strings without common characters score 0.0"""
+        assert catalog_service._calculate_similarity("abc", "xyz") == 0.0
+
+    def test_similar_names(self, catalog_service):
+        """Close profile names score between 0 and 1"""
+        score = catalog_service._calculate_similarity("юп1401", "юп1410")
+        assert 0.8 <= score < 1.0
+
+    def test_threshold_cutoff(self, catalog_service):
+        """Scores below the threshold are reported as 0.0"""
+        score = catalog_service._calculate_similarity("юп1401", "юп1410")
+        assert catalog_service._calculate_similarity("юп1401", "юп1410", threshold=0.8) == score
+        assert catalog_service._calculate_similarity("юп1401", "юп1410", threshold=0.9) == 0.0
+        assert catalog_service._calculate_similarity("алс", "алс", threshold=0.9) == 1.0
+
+
+def _profile(name, notes=None, quantity_per_hanger=None, length=None):
+    """Plain stand-in for Profile: only the attributes the scorer reads, no mock overhead"""
+    return SimpleNamespace(
+        name=name, notes=notes, quantity_per_hanger=quantity_per_hanger, length=length
+    )
+
+
+class TestCalculateMatchPriority:
+    """Tests for CatalogService._calculate_match_priority"""
+
+    def test_exact_name_match(self, catalog_service):
+        """Exact normalized name match has priority 1"""
+        assert catalog_service._calculate_match_priority(_profile("ALS-345"), "алс345") == 1
+
+    def test_name_contains_query(self, catalog_service):
+        """Partial name match has priority 2"""
+        assert catalog_service._calculate_match_priority(_profile("ЮП-1625"), "юп16") == 2
+
+    def test_notes_contain_query(self, catalog_service):
+        """Match in notes has priority 3"""
+        profile = _profile("ЮП-1625", notes="Корпус окна")
+        assert catalog_service._calculate_match_priority(profile, "корпус") == 3
+
+    def test_quantity_or_length_match(self, catalog_service):
+        """Digits matching quantity or length have priority 4"""
+        assert catalog_service._calculate_match_priority(_profile("КП-1", quantity_per_hanger=48), "48") == 4
+        assert catalog_service._calculate_match_priority(_profile("КП-1", length=6000.0), "600") == 4
+
+    def test_precomputed_query_digits(self, catalog_service):
+        """Passing query digits precomputed gives the same result"""
+        profile = _profile("КП-1", quantity_per_hanger=48)
+        assert catalog_service._calculate_match_priority(profile, "48", "48") == 4
+        assert catalog_service._calculate_match_priority(profile, "ас", "") is None
+
+    def test_no_match(self, catalog_service):
+        """Unrelated query returns None"""
+        assert catalog_service._calculate_match_priority(_profile("ЮП-1625"), "алс") is None
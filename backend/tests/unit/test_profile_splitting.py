@@ -17,7 +17,7 @@ def test_parse_profile_name_complex():
     """Test parse_profile_name with multiple processing types"""
     name, processing = parse_profile_name("юп-3233 греб + сверло")
     assert name == "юп-3233"
-    # Order is determined by order of PROCESSING_KEYWORDS in dashboard.py
+    # Order is determined by order of PROCESSING_KEYWORDS in catalog_service.py
     assert "греб" in processing
     assert "сверло" in processing
 
@@ -56,5 +56,5 @@ def test_excel_service_update_simulation_mode():
         excel_service.update_simulation_mode()
         assert excel_service._active_file_name == "test.xlsm"
         assert excel_service._cache is None
-        assert excel_service._cache_mtime is None
+        assert excel_service._cache_stat is None
         assert excel_service._cache_path is None
@@ -51,6 +51,12 @@ class TestNormalizeText:
         assert normalize_text("юп-3233") == "юп3233"
         assert normalize_text("ALS-345") == "алс345"
 
+    def test_idempotence(self):
+        """Normalizing already normalized text returns it unchanged"""
+        for text in ("ЮП-1625", "ALS-345", "als 345", "CP-100", "Корпус 12"):
+            once = normalize_text(text)
+            assert normalize_text(once) == once
+
 
 class TestTransliterateCyrillic:
     """Tests for transliterate_cyrillic function"""
@@ -0,0 +1,84 @@
+"""
+Unit tests for WebSocketManager broadcasting
+"""
+import json
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from app.services.websocket_manager import WebSocketManager
+from app.schemas.websocket import WebSocketMessage
+
+
+class MockWebSocket:
+    """Minimal WebSocket stand-in recording sent text frames"""
+
+    def __init__(self, fail: bool = False):
+        self.client_state = WebSocketState.CONNECTED
+        self.fail = fail
+        self.sent_messages = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        self.sent_messages.append(data)
+
+
+class TestWebSocketBroadcast:
+    """Tests for WebSocketManager.broadcast"""
+
+    @pytest.fixture
+    def manager(self):
+        return WebSocketManager()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_all_clients(self, manager):
+        """Every connected client receives the same JSON payload"""
+        clients = [MockWebSocket() for _ in range(5)]
+        for ws in clients:
+            await manager.connect(ws)
+
+        sent = await manager.broadcast_dict({"value": 42})
+
+        assert sent == 5
+        for ws in clients:
+            assert len(ws.sent_messages) == 1
+            data = json.loads(ws.sent_messages[0])
+            assert data["type"] == "data_update"
+            assert data["payload"] == {"value": 42}
+
+    @pytest.mark.asyncio
+    async def test_broadcast_excludes_sender(self, manager):
+        """Excluded client does not receive the message"""
+        sender, other = MockWebSocket(), MockWebSocket()
+        await manager.connect(sender)
+        await manager.connect(other)
+
+        sent = await manager.broadcast(
+            WebSocketMessage(type="status", payload={}), exclude=sender
+        )
+
+        assert sent == 1
+        assert sender.sent_messages == []
+        assert len(other.sent_messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_clients_are_disconnected(self, manager):
+        """Clients whose send fails are dropped from the connection set"""
+        good, bad = MockWebSocket(), MockWebSocket(fail=True)
+        await manager.connect(good)
+        await manager.connect(bad)
+
+        sent = await manager.broadcast_dict({"value": 1})
+
+        assert sent == 1
+        assert manager.connection_count == 1
+        assert bad not in manager.connections
+
+    @pytest.mark.asyncio
+    async def test_broadcast_without_clients(self, manager):
+        """Broadcast with no connections sends nothing"""
+        assert await manager.broadcast_dict({"value": 1}) == 0